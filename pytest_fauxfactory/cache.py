@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""Reuse generated values across runs for unchanged tests."""
+import hashlib
+import inspect
+import json
+from collections import Counter
+
+CACHE_PREFIX = 'fauxfactory'
+
+MODULE_CHANGED = 'module changed'
+MARK_CHANGED = 'mark arguments changed'
+SOURCE_CHANGED = 'callable source changed'
+HOOKS_CHANGED = 'value hooks changed'
+NOT_CACHED = 'not cached'
+NOT_SERIALIZABLE = 'values not JSON serializable'
+
+
+def _digest(text):
+    """Return the SHA-1 hexadecimal digest of text."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def source_digest(obj):
+    """Return a digest of the source code of obj.
+
+    Objects without available source, such as builtins, are identified by
+    their qualified name instead.
+    """
+    try:
+        return _digest(inspect.getsource(obj))
+    except (IOError, OSError, TypeError):
+        return _digest('{}.{}'.format(
+            getattr(obj, '__module__', None),
+            getattr(obj, '__qualname__', getattr(obj, '__name__', obj))))
+
+
+def describe(value, sources):
+    """Return a representation of a mark argument that is stable across
+    runs.
+
+    Callables and generators are described by their name and the digest of
+    their source, which is also added to sources.
+    """
+    if inspect.isgenerator(value):
+        sources.append(source_digest(value.gi_code))
+        arguments = {}
+        if value.gi_frame is not None:
+            arguments = dict(
+                (name, describe(local, sources))
+                for name, local in value.gi_frame.f_locals.items()
+                if not name.startswith('.')
+            )
+        return 'generator {}({})'.format(
+            value.gi_code.co_name, sorted(arguments.items()))
+    if callable(value):
+        sources.append(source_digest(value))
+        return 'callable {}.{}'.format(
+            getattr(value, '__module__', None),
+            getattr(value, '__name__', None))
+    if isinstance(value, (list, tuple)):
+        return [describe(item, sources) for item in value]
+    if isinstance(value, dict):
+        return sorted(
+            (key, describe(item, sources)) for key, item in value.items())
+    return repr(value)
+
+
+class CollectionCache(object):
+    """Store generated values in the pytest cache keyed by everything they
+    depend on."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.reused = []
+        self.regenerated = []
+        self._module_digests = {}
+
+    def module_digest(self, path):
+        """Return the digest of a module file content, read once per run."""
+        if path.endswith(('.pyc', '.pyo')):
+            path = path[:-1]
+        if path not in self._module_digests:
+            with open(path, 'rb') as handle:
+                self._module_digests[path] = hashlib.sha1(
+                    handle.read()).hexdigest()
+        return self._module_digests[path]
+
+    def make_key(self, module_path, mark_name, args, kwargs, hooks=()):
+        """Build the cache key parts of a mark.
+
+        hooks are the hook implementations transforming or ignoring the
+        generated values, cached values are stale once their source changes.
+        """
+        sources = []
+        mark = json.dumps(
+            [mark_name, describe(args, sources), describe(kwargs, sources)])
+        return {
+            'module': self.module_digest(module_path),
+            'mark': _digest(mark),
+            'source': _digest(''.join(sources)),
+            'hooks': _digest(''.join(source_digest(hook) for hook in hooks)),
+        }
+
+    def get(self, node_name, key):
+        """Return the cached values for node_name or None when they are
+        missing or stale."""
+        entry = self.cache.get('{}/{}'.format(CACHE_PREFIX, node_name), None)
+        if entry is None:
+            reason = NOT_CACHED
+        elif entry['key']['module'] != key['module']:
+            reason = MODULE_CHANGED
+        elif entry['key']['mark'] != key['mark']:
+            reason = MARK_CHANGED
+        elif entry['key']['source'] != key['source']:
+            reason = SOURCE_CHANGED
+        elif entry['key'].get('hooks') != key['hooks']:
+            reason = HOOKS_CHANGED
+        else:
+            self.reused.append(node_name)
+            return entry['values']
+        self.regenerated.append((node_name, reason))
+        return None
+
+    def set(self, node_name, key, values):
+        """Store values for node_name, unless they do not survive a JSON round
+        trip unchanged."""
+        try:
+            cacheable = json.loads(json.dumps(values)) == values
+        except (TypeError, ValueError):
+            cacheable = False
+        if not cacheable:
+            self.regenerated[-1] = (node_name, NOT_SERIALIZABLE)
+            return
+        self.cache.set(
+            '{}/{}'.format(CACHE_PREFIX, node_name),
+            {'key': key, 'values': values})
+
+    def report(self, terminalreporter):
+        """Write the cache usage and invalidation reasons to the terminal."""
+        if not self.reused and not self.regenerated:
+            return
+        terminalreporter.write_sep('-', 'fauxfactory cache')
+        terminalreporter.write_line('{} reused, {} regenerated'.format(
+            len(self.reused), len(self.regenerated)))
+        if terminalreporter.config.option.verbose > 0:
+            for node_name, reason in self.regenerated:
+                terminalreporter.write_line(
+                    '  {}: {}'.format(node_name, reason))
+        else:
+            reasons = Counter(reason for _, reason in self.regenerated)
+            for reason, count in sorted(reasons.items()):
+                terminalreporter.write_line(
+                    '  {}: {}'.format(reason, count))
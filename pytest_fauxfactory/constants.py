@@ -10,3 +10,10 @@ STRING_TYPES = (
     'utf8',
     'punctuation',
 )
+
+INDEX_ID_MODE = 'index'
+HASH_ID_MODE = 'hash'
+ID_MODES = (INDEX_ID_MODE, HASH_ID_MODE)
+
+# Number of hexadecimal digest characters used by hash based test IDs
+HASH_ID_LENGTH = 8
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""Stream generated values to and from dataset files.
+
+Two record formats are supported, chosen by file extension:
+
+* ``.jsonl``: one JSON document per line.
+* ``.bin``: each record is a 4 byte big-endian length followed by a pickled
+  payload of that length.
+"""
+import hashlib
+import io
+import json
+import os
+import pickle
+import re
+import struct
+from array import array
+from itertools import islice
+
+from pytest_fauxfactory.lazy import LazyValue
+
+JSONL_FORMAT = 'jsonl'
+BINARY_FORMAT = 'bin'
+DATASET_FORMATS = (JSONL_FORMAT, BINARY_FORMAT)
+
+_LENGTH_PREFIX = struct.Struct('>I')
+_UNSAFE_CHARS = re.compile(r'[^\w.-]+')
+
+
+def dataset_format(path):
+    """Return the record format of a dataset file based on its extension."""
+    extension = os.path.splitext(path)[1].lstrip('.')
+    if extension not in DATASET_FORMATS:
+        raise ValueError(
+            'Unsupported dataset file {}, expected one of the extensions: {}'
+            .format(path, ', '.join(DATASET_FORMATS)))
+    return extension
+
+
+def shard_name(nodeid, mark_name, fmt=JSONL_FORMAT, worker_id=None):
+    """Build a file system safe shard file name for a test node.
+
+    Every pytest-xdist worker generates its own values, the worker_id keeps
+    their shards apart.
+    """
+    names = [_UNSAFE_CHARS.sub('_', nodeid), mark_name]
+    if worker_id is not None:
+        names.append(worker_id)
+    names.append(fmt)
+    return '.'.join(names)
+
+
+class DatasetWriter(object):
+    """Write records to a dataset file as soon as they are produced."""
+
+    def __init__(self, path):
+        self.path = path
+        self.format = dataset_format(path)
+        self.count = 0
+        self._handle = io.open(path, 'wb')
+
+    def write(self, value):
+        """Append a single record to the dataset file."""
+        if self.format == JSONL_FORMAT:
+            payload = json.dumps(value, sort_keys=True).encode('utf-8')
+            self._handle.write(payload + b'\n')
+        else:
+            payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            self._handle.write(_LENGTH_PREFIX.pack(len(payload)))
+            self._handle.write(payload)
+        self.count += 1
+
+    def close(self):
+        """Flush and close the dataset file."""
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Dataset(object):
+    """Lazy, random access reader for a dataset file.
+
+    Records are never loaded all at once: the file is scanned a single time
+    to build a compact index of record offsets, then each record is decoded
+    only when it is requested. When items is given only the first items
+    records are indexed, without scanning the rest of the file.
+    """
+
+    def __init__(self, path, items=None):
+        self.path = path
+        self.format = dataset_format(path)
+        self.items = items
+        self._offsets = None
+
+    def _scan(self):
+        """Yield the byte offset of every record in the file."""
+        with io.open(self.path, 'rb') as handle:
+            offset = 0
+            if self.format == JSONL_FORMAT:
+                for line in handle:
+                    if line.strip():
+                        yield offset
+                    offset += len(line)
+            else:
+                while True:
+                    header = handle.read(_LENGTH_PREFIX.size)
+                    if not header:
+                        break
+                    if len(header) < _LENGTH_PREFIX.size:
+                        raise ValueError(
+                            'Truncated record header in {} at offset {}'
+                            .format(self.path, offset))
+                    yield offset
+                    size, = _LENGTH_PREFIX.unpack(header)
+                    offset += _LENGTH_PREFIX.size + size
+                    handle.seek(offset)
+
+    @property
+    def offsets(self):
+        """Byte offset of every indexed record, built on first access."""
+        if self._offsets is None:
+            self._offsets = array('q', islice(self._scan(), self.items))
+        return self._offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _read_raw(self, handle):
+        """Return the encoded record at the current position of handle."""
+        if self.format == JSONL_FORMAT:
+            return handle.readline().rstrip()
+        size, = _LENGTH_PREFIX.unpack(handle.read(_LENGTH_PREFIX.size))
+        return handle.read(size)
+
+    def _read(self, handle):
+        """Decode the record at the current position of handle."""
+        payload = self._read_raw(handle)
+        if self.format == JSONL_FORMAT:
+            return json.loads(payload.decode('utf-8'))
+        return pickle.loads(payload)
+
+    def raw(self, index):
+        """Return the encoded bytes of a record, without decoding it."""
+        with io.open(self.path, 'rb') as handle:
+            handle.seek(self.offsets[index])
+            return self._read_raw(handle)
+
+    def __getitem__(self, index):
+        offset = self.offsets[index]
+        with io.open(self.path, 'rb') as handle:
+            handle.seek(offset)
+            return self._read(handle)
+
+    def iter_records(self, items=None):
+        """Stream indexed records from the start of the file, up to items
+        records when provided."""
+        with io.open(self.path, 'rb') as handle:
+            for offset in islice(self.offsets, items):
+                handle.seek(offset)
+                yield self._read(handle)
+
+    def __iter__(self):
+        return self.iter_records()
+
+
+class DatasetRecord(LazyValue):
+    """Placeholder parametrized in place of a dataset record, decoded through
+    the dataset offset index when the test is set up."""
+
+    def __init__(self, dataset, index):
+        self.dataset = dataset
+        self.index = index
+
+    def resolve(self):
+        return self.dataset[self.index]
+
+    def digest(self):
+        return hashlib.sha1(self.dataset.raw(self.index)).hexdigest()
+
+    def unpack(self, count):
+        """Return a tuple of count placeholders, one per field of the record,
+        to be unpacked into count test arguments."""
+        return tuple(
+            DatasetField(self.dataset, self.index, position, count)
+            for position in range(count))
+
+    def __repr__(self):
+        return '<dataset {} record {}>'.format(
+            os.path.basename(self.dataset.path), self.index)
+
+
+class DatasetField(DatasetRecord):
+    """Placeholder for the field at position of a dataset record holding
+    count fields."""
+
+    def __init__(self, dataset, index, position, count):
+        super(DatasetField, self).__init__(dataset, index)
+        self.position = position
+        self.count = count
+
+    def resolve(self):
+        record = super(DatasetField, self).resolve()
+        if not isinstance(record, (list, tuple)) or len(record) != self.count:
+            raise ValueError(
+                'Record {} of {} can not be unpacked into {} arguments: {!r}'
+                .format(self.index, self.dataset.path, self.count, record))
+        return record[self.position]
+
+    def __repr__(self):
+        return '<dataset {} record {} field {}>'.format(
+            os.path.basename(self.dataset.path), self.index, self.position)
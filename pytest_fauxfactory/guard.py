@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Limit the time and memory spent generating each value."""
+import threading
+from timeit import default_timer
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+# Seconds between two checks of a value being generated
+POLL_INTERVAL = 0.01
+
+
+class GenerationLimitError(Exception):
+    """Raised when generating a value exceeds a limit."""
+
+
+class GenerationGuard(object):
+    """Generate values in a watchdog supervised thread.
+
+    Every value is generated in its own daemon thread while the calling
+    thread checks the elapsed time and, when max_memory is given, the memory
+    allocated since the value generation started, as traced by
+    ``tracemalloc``. Memory is checked again once the value is generated,
+    using the traced peak so that short allocation spikes are caught, on
+    Python versions providing ``tracemalloc.reset_peak``. A thread exceeding
+    a limit can not be stopped, it is left running in the background and
+    GenerationLimitError is raised.
+    """
+
+    def __init__(self, timeout=None, max_memory=None):
+        if max_memory is not None and tracemalloc is None:
+            raise RuntimeError('max_memory requires the tracemalloc module.')
+        self.timeout = timeout
+        self.max_memory = max_memory
+
+    def _check_memory(self, start_memory):
+        """Raise GenerationLimitError when more than max_memory bytes were
+        allocated since start_memory was traced."""
+        current, peak = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, 'reset_peak'):
+            current = peak
+        if current - start_memory > self.max_memory:
+            raise GenerationLimitError(
+                'allocated more than {} bytes'.format(self.max_memory))
+
+    def _generate(self, values):
+        """Return the next value of values, generated in a separate thread.
+
+        Raise StopIteration once values is exhausted.
+        """
+        result = {}
+
+        def step():
+            try:
+                result['value'] = next(values)
+            except BaseException as err:
+                result['error'] = err
+
+        worker = threading.Thread(target=step)
+        worker.daemon = True
+        start = default_timer()
+        if self.max_memory is not None:
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        worker.start()
+        while True:
+            worker.join(POLL_INTERVAL)
+            if not worker.is_alive():
+                break
+            if (self.timeout is not None and
+                    default_timer() - start > self.timeout):
+                raise GenerationLimitError(
+                    'took more than {} seconds'.format(self.timeout))
+            if self.max_memory is not None:
+                self._check_memory(start_memory)
+        if self.max_memory is not None:
+            self._check_memory(start_memory)
+        if 'error' in result:
+            raise result['error']
+        return result['value']
+
+    def guarded(self, values):
+        """Iterate over values, raising GenerationLimitError with the index of
+        the first value exceeding a limit."""
+        values = iter(values)
+        started_tracing = False
+        if self.max_memory is not None and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        try:
+            item_index = 0
+            while True:
+                try:
+                    value = self._generate(values)
+                except StopIteration:
+                    break
+                except GenerationLimitError as err:
+                    raise GenerationLimitError(
+                        'item {} {}'.format(item_index, err))
+                yield value
+                item_index += 1
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
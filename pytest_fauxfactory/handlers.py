@@ -1,17 +1,27 @@
 # -*- coding: utf-8 -*-
 """Methods to handle specific pytest marks."""
+import os
 from inspect import isgenerator
 
 import pytest
 
 from pytest_fauxfactory.constants import STRING_TYPES
-from pytest_fauxfactory.marks import faux_callable, faux_generator, faux_string
+from pytest_fauxfactory.dataset import DATASET_FORMATS, dataset_format
+from pytest_fauxfactory.marks import (
+    faux_callable,
+    faux_dataset,
+    faux_generator,
+    faux_pooled_callable,
+    faux_string,
+)
+from pytest_fauxfactory.pool import ObjectPool
 
 
 def callable_mark_handler(args, kwargs):
     """"pytest faux_callable mark handler"""
     usage_message = (
-        'usage: faux_callable(items, callable_function, *args, **kwargs)'
+        'usage: faux_callable(items, callable_function, *args, '
+        'faux_pool=False, faux_reset=None, faux_max_size=1, **kwargs)'
     )
 
     if len(args) < 2:
@@ -33,9 +43,63 @@ def callable_mark_handler(args, kwargs):
             'Mark expected a callable function, got a {}: {}'.format(
                 type(callable_function), callable_function))
 
+    kwargs = dict(kwargs)
+    if kwargs.pop('faux_pool', False):
+        reset = kwargs.pop('faux_reset', None)
+        max_size = kwargs.pop('faux_max_size', 1)
+        if reset is not None and not callable(reset):
+            raise pytest.UsageError(
+                'Mark expected a callable faux_reset function, got a {}: {}'
+                .format(type(reset), reset))
+        if not isinstance(max_size, int) or max_size < 1:
+            raise pytest.UsageError(
+                'Mark expected faux_max_size to be an integer greater than '
+                '0, got {}'.format(max_size))
+        return faux_pooled_callable(items, ObjectPool(
+            getattr(callable_function, '__name__', repr(callable_function)),
+            callable_function,
+            args[2:],
+            kwargs,
+            reset=reset,
+            max_size=max_size,
+        ))
+
     return faux_callable(items, callable_function, *args[2:], **kwargs)
 
 
+def dataset_mark_handler(args, kwargs):
+    """"pytest faux_dataset mark handler."""
+    usage_message = 'usage: faux_dataset(path, items=None)'
+
+    if len(args) == 0:
+        raise pytest.UsageError(
+            'Missing arguments: {0}'.format(usage_message)
+        )
+
+    path = args[0]
+    items = args[1] if len(args) > 1 else kwargs.get('items')
+    if not os.path.isfile(path):
+        raise pytest.UsageError(
+            'Dataset file {} does not exist.'.format(path))
+    try:
+        dataset_format(path)
+    except ValueError:
+        raise pytest.UsageError(
+            'Dataset file {} must have one of the extensions: {}'.format(
+                path, ', '.join(DATASET_FORMATS)))
+    if items is not None:
+        if not isinstance(items, int):
+            raise pytest.UsageError(
+                'Mark expected an integer, got a {}: {}'.format(
+                    type(items), items))
+        if items < 1:
+            raise pytest.UsageError(
+                'Mark expected an integer greater than 0, got {}'.format(
+                    items))
+
+    return faux_dataset(path, items)
+
+
 def generator_mark_handler(args, kwargs=None):
     """"pytest faux_generator mark handler."""
     usage_message = 'usage: faux_generator(generator)'
@@ -81,6 +145,7 @@ def string_mark_handler(args, kwargs):
 
 MARK_HANDLERS = {
     'faux_callable': callable_mark_handler,
+    'faux_dataset': dataset_mark_handler,
     'faux_generator': generator_mark_handler,
     'faux_string': string_mark_handler,
 }
@@ -1,9 +1,80 @@
 # -*- coding: utf-8 -*-
 """Provides helper methods to pytest-fauxfactory."""
+import hashlib
+import json
+import os
 
+from pytest_fauxfactory.constants import (
+    HASH_ID_LENGTH,
+    HASH_ID_MODE,
+    INDEX_ID_MODE,
+)
+from pytest_fauxfactory.lazy import LazyValue
 
-def generate_ids(data, func_name):
+
+def _lazy_digest(value):
+    """Encode lazy values nested in a generated value by their digest."""
+    if isinstance(value, LazyValue):
+        digest = value.digest()
+        if digest is not None:
+            return digest
+    raise TypeError('{!r} has no stable digest'.format(value))
+
+
+def value_digest(value):
+    """Return a stable hexadecimal digest of a generated value.
+
+    Text and bytes are hashed as they are, lazy values through their digest
+    method, other values through their canonical JSON form. Return None for
+    values without a representation that is stable across runs, such as sets
+    or arbitrary objects.
+    """
+    if isinstance(value, LazyValue):
+        return value.digest()
+    if not isinstance(value, bytes):
+        if not isinstance(value, type(u'')):
+            try:
+                value = json.dumps(
+                    value, sort_keys=True, separators=(',', ':'),
+                    default=_lazy_digest)
+            except (TypeError, ValueError):
+                return None
+        value = value.encode('utf-8')
+    return hashlib.sha1(value).hexdigest()
+
+
+def generate_hash_ids(data, func_name):
+    """Generate IDs from a short digest of each value.
+
+    The digests are lengthened until they are unique within data, equal
+    values get an extra occurrence suffix. Values without a stable digest
+    keep their index based ID.
+    """
+    digests = [value_digest(value) for value in data]
+    unique_digests = set(digest for digest in digests if digest is not None)
+    length = HASH_ID_LENGTH
+    while len(set(digest[:length] for digest in unique_digests)) < len(
+            unique_digests):
+        length += HASH_ID_LENGTH
+    ids = []
+    seen = {}
+    for idx, digest in enumerate(digests):
+        if digest is None:
+            ids.append('{}_{}'.format(func_name, idx))
+            continue
+        value_id = '{}_{}'.format(func_name, digest[:length])
+        occurrence = seen.get(value_id, 0)
+        seen[value_id] = occurrence + 1
+        if occurrence:
+            value_id = '{}_{}'.format(value_id, occurrence)
+        ids.append(value_id)
+    return ids
+
+
+def generate_ids(data, func_name, mode=INDEX_ID_MODE):
     """Generate IDs for parametrize method."""
+    if mode == HASH_ID_MODE:
+        return generate_hash_ids(data, func_name)
     return [
         '{}_{}'.format(func_name, idx)
         for idx
@@ -11,8 +82,40 @@ def generate_ids(data, func_name):
     ]
 
 
+def get_argnames(argnames):
+    """Return the list of argument names given to a mark."""
+    if isinstance(argnames, (list, tuple)):
+        return list(argnames)
+    return [name.strip() for name in argnames.split(',') if name.strip()]
+
+
+def get_dataset_path(config, path):
+    """Resolve a relative dataset path against the pytest root directory."""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(str(config.rootdir), path)
+
+
 def get_mark_function(metafunc):
     """Extract the name of the function being called."""
     for key in metafunc.function.__dict__:
         if key.lower().startswith('faux'):
             return getattr(metafunc.function, key)
+
+
+def get_node_name(metafunc):
+    """Build a dotted name identifying the test function being
+    parametrized."""
+    names = [metafunc.module.__name__]
+    if metafunc.cls is not None:
+        names.append(metafunc.cls.__name__)
+    names.append(metafunc.function.__name__)
+    return '.'.join(names)
+
+
+def get_worker_id(config):
+    """Return the pytest-xdist worker id, or None outside of a worker."""
+    workerinput = getattr(config, 'workerinput', None)
+    if workerinput is None:
+        workerinput = getattr(config, 'slaveinput', {})
+    return workerinput.get('workerid')
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Hook specifications of pytest-fauxfactory.
+
+Implement them in a ``conftest.py`` file or a plugin to observe or change
+the values generated by faux marks. Values reused by ``--faux-cache`` are not
+generated again, so these hooks are not called for them, but changing an
+implementation of ``pytest_faux_transform_value`` or
+``pytest_faux_ignore_value`` invalidates the cached values. Pooled objects and
+dataset records are only built when their test is set up, the hooks receive
+their placeholders instead.
+"""
+import pytest
+
+
+def pytest_faux_before_generate(metafunc, mark_name):
+    """Called before the values of a faux mark are generated.
+
+    :param metafunc: the pytest ``Metafunc`` of the test being parametrized
+    :param str mark_name: name of the faux mark, e.g. ``faux_string``
+    """
+
+
+def pytest_faux_value_generated(metafunc, mark_name, item_index, value,
+                                duration):
+    """Called for every generated value, before it is transformed or
+    ignored.
+
+    :param metafunc: the pytest ``Metafunc`` of the test being parametrized
+    :param str mark_name: name of the faux mark
+    :param int item_index: position of the value in the generated values
+    :param value: the generated value
+    :param float duration: seconds spent generating the value
+    """
+
+
+@pytest.hookspec(firstresult=True)
+def pytest_faux_transform_value(metafunc, mark_name, item_index, value):
+    """Return a value other than None to replace a generated value.
+
+    Stops at first non-None result.
+
+    :param metafunc: the pytest ``Metafunc`` of the test being parametrized
+    :param str mark_name: name of the faux mark
+    :param int item_index: position of the value in the generated values
+    :param value: the generated value
+    """
+
+
+@pytest.hookspec(firstresult=True)
+def pytest_faux_ignore_value(metafunc, mark_name, item_index, value):
+    """Return True to drop a generated value, no test is generated for it.
+
+    Stops at first non-None result.
+
+    :param metafunc: the pytest ``Metafunc`` of the test being parametrized
+    :param str mark_name: name of the faux mark
+    :param int item_index: position of the value in the generated values
+    :param value: the generated value, after ``pytest_faux_transform_value``
+    """
+
+
+def pytest_faux_after_generate(metafunc, mark_name, stats):
+    """Called once all the values of a faux mark are generated.
+
+    :param metafunc: the pytest ``Metafunc`` of the test being parametrized
+    :param str mark_name: name of the faux mark
+    :param stats: a ``pytest_fauxfactory.stats.GenerationStats`` instance
+    """
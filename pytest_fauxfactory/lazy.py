@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""Placeholders for values built only when their test is set up."""
+
+
+class LazyValue(object):
+    """Placeholder parametrized in place of a value.
+
+    The plugin replaces it by the value returned by resolve when the test
+    argument is set up, before any fixture depending on it, and calls release
+    with that value once the argument is torn down.
+    """
+
+    def resolve(self):
+        """Build the value passed to the test."""
+        raise NotImplementedError
+
+    def release(self, value):
+        """Called with the resolved value once the test is torn down."""
+
+    def digest(self):
+        """Return a hexadecimal digest of the value that is stable across
+        runs, used for hash test IDs, or None when there is none."""
+        return None
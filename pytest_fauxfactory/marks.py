@@ -5,6 +5,8 @@ from itertools import chain, cycle
 import fauxfactory
 
 from pytest_fauxfactory.constants import STRING_TYPES
+from pytest_fauxfactory.dataset import Dataset, DatasetRecord
+from pytest_fauxfactory.pool import PooledValue
 
 
 def faux_callable(items, callable_func, *args, **kwargs):
@@ -15,6 +17,20 @@ def faux_callable(items, callable_func, *args, **kwargs):
         yield callable_func(*args, **kwargs)
 
 
+def faux_pooled_callable(items, pool):
+    """Generate placeholders for objects taken from a pool at setup."""
+    for index in range(items):
+        yield PooledValue(pool, index)
+
+
+def faux_dataset(path, items=None):
+    """Generate placeholders for the records of a dataset file, decoded when
+    their test is set up."""
+    dataset = Dataset(path, items)
+    for index in range(len(dataset)):
+        yield DatasetRecord(dataset, index)
+
+
 def faux_generator(*args):
     """Generate values from generators passed as arguments."""
     return chain.from_iterable(args)
@@ -1,25 +1,381 @@
 # -*- coding: utf-8 -*-
 """Analyse pytest-fauxfactory marks and passes arguments and keywords to
 pytest's parametrize method."""
+import functools
+import os
+import sys
+
+import pytest
+
+from pytest_fauxfactory.cache import CollectionCache
+from pytest_fauxfactory.constants import ID_MODES, INDEX_ID_MODE
+from pytest_fauxfactory.dataset import (
+    DATASET_FORMATS,
+    JSONL_FORMAT,
+    DatasetRecord,
+    DatasetWriter,
+    shard_name,
+)
+from pytest_fauxfactory import hooks
+from pytest_fauxfactory.guard import GenerationGuard, GenerationLimitError
 from pytest_fauxfactory.handlers import MARK_HANDLERS
+from pytest_fauxfactory.lazy import LazyValue
+from pytest_fauxfactory.pool import PooledValue, report_pools
+from pytest_fauxfactory.shrink import failure_signature, shrink, shrink_string
+from pytest_fauxfactory.stats import GenerationStats
+
+from pytest_fauxfactory.helpers import (
+    generate_ids,
+    get_argnames,
+    get_dataset_path,
+    get_mark_function,
+    get_node_name,
+    get_worker_id,
+)
+
+
+def pytest_addhooks(pluginmanager):
+    """Register pytest-fauxfactory hook specifications."""
+    pluginmanager.add_hookspecs(hooks)
+
+
+def pytest_addoption(parser):
+    """Add pytest-fauxfactory command line options."""
+    group = parser.getgroup('fauxfactory')
+    group.addoption(
+        '--faux-dump',
+        action='store',
+        dest='faux_dump',
+        default=None,
+        metavar='DIR',
+        help='Stream the values generated by faux marks into one dataset '
+             'file per test in DIR.')
+    group.addoption(
+        '--faux-dump-format',
+        action='store',
+        dest='faux_dump_format',
+        default=JSONL_FORMAT,
+        choices=DATASET_FORMATS,
+        help='Record format of the dumped dataset files: "jsonl" or '
+             'length-prefixed pickle "bin" (default: jsonl).')
+    group.addoption(
+        '--faux-ids',
+        action='store',
+        dest='faux_ids',
+        default=INDEX_ID_MODE,
+        choices=ID_MODES,
+        help='How faux test IDs are built: from the position of the value '
+             '("index") or from a digest of the value ("hash"). Hash IDs only '
+             'match across runs when the values are reproduced, with '
+             '--faux-cache or faux_dataset (default: index).')
+    group.addoption(
+        '--faux-cache',
+        action='store_true',
+        dest='faux_cache',
+        default=False,
+        help='Reuse the values generated by a previous run for tests whose '
+             'module, mark arguments and callable source did not change.')
+    group.addoption(
+        '--faux-timeout',
+        action='store',
+        dest='faux_timeout',
+        default=None,
+        type=float,
+        metavar='SECONDS',
+        help='Fail the collection of a test when generating one of its faux '
+             'values takes longer than SECONDS. Marks can override it with '
+             'the faux_timeout keyword.')
+    group.addoption(
+        '--faux-max-memory',
+        action='store',
+        dest='faux_max_memory',
+        default=None,
+        type=int,
+        metavar='BYTES',
+        help='Fail the collection of a test when generating one of its faux '
+             'values allocates more than BYTES. Marks can override it with '
+             'the faux_max_memory keyword.')
+    group.addoption(
+        '--faux-shrink',
+        action='store_true',
+        dest='faux_shrink',
+        default=False,
+        help='Rerun failing tests with simpler versions of their faux string '
+             'value, or the values given by the faux_shrink keyword of the '
+             'mark, and report the minimal failing value.')
+    group.addoption(
+        '--faux-shrink-budget',
+        action='store',
+        dest='faux_shrink_budget',
+        default=10.0,
+        type=float,
+        metavar='SECONDS',
+        help='Time spent shrinking the value of each failing test '
+             '(default: 10).')
+
+
+def pytest_configure(config):
+    """Set up the collection cache when `--faux-cache` is given and the
+    registries of object pools and shrinkable tests."""
+    config._faux_pools = []
+    config._faux_shrink_targets = {}
+    config._faux_shrunk = []
+    config._faux_cache = None
+    if config.getoption('faux_cache'):
+        if getattr(config, 'cache', None) is None:
+            raise pytest.UsageError(
+                '--faux-cache requires the cacheprovider plugin.')
+        config._faux_cache = CollectionCache(config.cache)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report the collection cache and object pools usage."""
+    faux_cache = terminalreporter.config._faux_cache
+    if faux_cache is not None:
+        faux_cache.report(terminalreporter)
+    report_pools(terminalreporter, terminalreporter.config._faux_pools)
+    shrunk = terminalreporter.config._faux_shrunk
+    if shrunk:
+        terminalreporter.write_sep('-', 'fauxfactory shrink')
+        for nodeid, result in shrunk:
+            terminalreporter.write_line('{}: {}'.format(nodeid, result))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """Replace lazy value placeholders by their value when the test argument
+    is set up, so fixtures depending on it also get the value."""
+    outcome = yield
+    if outcome.excinfo is not None:
+        return
+    placeholder = outcome.get_result()
+    if not isinstance(placeholder, LazyValue):
+        return
+    cache_key = fixturedef.cached_result[1]
+    try:
+        value = placeholder.resolve()
+    except Exception:
+        fixturedef.cached_result = (None, cache_key, sys.exc_info())
+        raise
+    if isinstance(placeholder, PooledValue):
+        pools = request.config._faux_pools
+        if placeholder.pool not in pools:
+            pools.append(placeholder.pool)
+    fixturedef.cached_result = (value, cache_key, None)
+    fixturedef.addfinalizer(functools.partial(placeholder.release, value))
+    outcome.force_result(value)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Shrink the faux value of a failing test when `--faux-shrink` is
+    given."""
+    outcome = yield
+    report = outcome.get_result()
+    if call.when != 'call' or not report.failed:
+        return
+    target = item.config._faux_shrink_targets.get(
+        getattr(item, 'function', None))
+    if target is None:
+        return
+    argname, candidates = target
+    funcargs = item.funcargs
+    value = funcargs[argname]
+    if candidates is None:
+        if not isinstance(value, type(u'')):
+            return
+        candidates = shrink_string
+
+    signature = failure_signature(call.excinfo.type, call.excinfo.tb)
+
+    def fails(candidate):
+        """Rerun the test with candidate, return True if it fails the same
+        way as the original value."""
+        funcargs[argname] = candidate
+        try:
+            item.runtest()
+        except pytest.skip.Exception:
+            return False
+        except (Exception, pytest.fail.Exception):
+            exc_type, _, tb = sys.exc_info()
+            return failure_signature(exc_type, tb) == signature
+        finally:
+            funcargs[argname] = value
+        return False
+
+    result = shrink(
+        value, fails, candidates,
+        item.config.getoption('faux_shrink_budget'))
+    report.sections.append(('faux shrink', str(result)))
+    item.config._faux_shrunk.append((item.nodeid, result))
+
+
+def register_shrink_target(metafunc, argnames, kwargs):
+    """Pop the faux_shrink callback of a mark from kwargs and register the test
+    for shrinking when `--faux-shrink` is given."""
+    candidates = kwargs.pop('faux_shrink', None)
+    if candidates is not None and not callable(candidates):
+        raise pytest.UsageError(
+            'Mark expected a callable faux_shrink function, got a {}: {}'
+            .format(type(candidates), candidates))
+    argnames = get_argnames(argnames)
+    if metafunc.config.getoption('faux_shrink') and len(argnames) == 1:
+        metafunc.config._faux_shrink_targets[metafunc.function] = (
+            argnames[0], candidates)
+
+
+def get_guard(metafunc, kwargs):
+    """Pop the generation limits of a mark from kwargs and return the guard
+    enforcing them, if any."""
+    timeout = kwargs.pop(
+        'faux_timeout', metafunc.config.getoption('faux_timeout'))
+    max_memory = kwargs.pop(
+        'faux_max_memory', metafunc.config.getoption('faux_max_memory'))
+    if timeout is None and max_memory is None:
+        return None
+    if timeout is not None and (
+            not isinstance(timeout, (int, float)) or timeout <= 0):
+        raise pytest.UsageError(
+            'Mark expected faux_timeout to be a number greater than 0, got {}'
+            .format(timeout))
+    if max_memory is not None and (
+            not isinstance(max_memory, int) or max_memory < 1):
+        raise pytest.UsageError(
+            'Mark expected faux_max_memory to be an integer greater than 0, '
+            'got {}'.format(max_memory))
+    try:
+        return GenerationGuard(timeout, max_memory)
+    except RuntimeError as err:
+        raise pytest.UsageError(str(err))
+
+
+def get_value_hooks(config):
+    """Return the hook implementations changing the generated values."""
+    return [
+        hookimpl.function
+        for hook in (config.hook.pytest_faux_transform_value,
+                     config.hook.pytest_faux_ignore_value)
+        for hookimpl in hook.get_hookimpls()
+    ]
+
+
+def generate_values(metafunc, mark_name, args, kwargs, guard=None):
+    """Generate the values of a mark, calling the generation hooks."""
+    hook = metafunc.config.hook
+    hook.pytest_faux_before_generate(metafunc=metafunc, mark_name=mark_name)
+    stats = GenerationStats()
+    data = MARK_HANDLERS[mark_name](args, kwargs)
+    if guard is not None:
+        data = guard.guarded(data)
+    try:
+        for item_index, (value, duration) in enumerate(stats.timed(data)):
+            hook.pytest_faux_value_generated(
+                metafunc=metafunc,
+                mark_name=mark_name,
+                item_index=item_index,
+                value=value,
+                duration=duration)
+            replacement = hook.pytest_faux_transform_value(
+                metafunc=metafunc,
+                mark_name=mark_name,
+                item_index=item_index,
+                value=value)
+            if replacement is not None:
+                value = replacement
+            if hook.pytest_faux_ignore_value(
+                    metafunc=metafunc,
+                    mark_name=mark_name,
+                    item_index=item_index,
+                    value=value):
+                stats.ignored += 1
+                continue
+            yield value
+    except GenerationLimitError as err:
+        pytest.fail(
+            'Generating {} values of {}: {}'.format(
+                mark_name, get_node_name(metafunc), err),
+            pytrace=False)
+    hook.pytest_faux_after_generate(
+        metafunc=metafunc, mark_name=mark_name, stats=stats)
+
+
+def collect_values(metafunc, mark_name, data):
+    """Consume generated values, dumping each one as it is produced when
+    `--faux-dump` is given."""
+    dump_dir = metafunc.config.getoption('faux_dump')
+    if not dump_dir:
+        return [_ for _ in data]
 
-from pytest_fauxfactory.helpers import generate_ids, get_mark_function
+    if not os.path.isdir(dump_dir):
+        os.makedirs(dump_dir)
+    path = os.path.join(dump_dir, shard_name(
+        get_node_name(metafunc),
+        mark_name,
+        metafunc.config.getoption('faux_dump_format'),
+        get_worker_id(metafunc.config)))
+    values = []
+    with DatasetWriter(path) as writer:
+        for value in data:
+            if isinstance(value, LazyValue):
+                # Lazy values only exist while their test runs
+                values.append(value)
+                continue
+            try:
+                writer.write(value)
+            except TypeError as err:
+                raise pytest.UsageError(
+                    'Unable to dump value {!r} to {}: {}. Use '
+                    '--faux-dump-format=bin for non JSON values.'.format(
+                        value, path, err))
+            values.append(value)
+    return values
 
 
 def pytest_generate_tests(metafunc):
     """Parametrize tests using `faux_string` `faux_callable` 'faux_generator'
-    marks."""
+    `faux_dataset` marks."""
     func = get_mark_function(metafunc)
     if func:
         args = func.args
         kwargs = func.kwargs
         argnames = kwargs.pop('argnames', 'value')
+        if func.name == 'faux_dataset' and args:
+            args = (get_dataset_path(metafunc.config, args[0]),) + args[1:]
+        guard = get_guard(metafunc, kwargs)
+        register_shrink_target(metafunc, argnames, kwargs)
 
-        data = MARK_HANDLERS[func.name](args, kwargs)
+        data = None
+        faux_cache = metafunc.config._faux_cache
+        if faux_cache is not None:
+            cache_name = '{}/{}'.format(get_node_name(metafunc), func.name)
+            cache_key = faux_cache.make_key(
+                metafunc.module.__file__, func.name, args, kwargs,
+                get_value_hooks(metafunc.config))
+            data = faux_cache.get(cache_name, cache_key)
+        if data is None:
+            generated = True
+            data = generate_values(
+                metafunc, func.name, args, kwargs, guard)
+        else:
+            generated = False
 
-        if data:
-            data = [_ for _ in data]
+        if data is not None:
+            data = collect_values(metafunc, func.name, data)
+            count = len(get_argnames(argnames))
+            if data and isinstance(data[0], PooledValue) and count > 1:
+                raise pytest.UsageError(
+                    'Pooled values can not be unpacked into multiple '
+                    'arguments: {}'.format(argnames))
+            if faux_cache is not None and generated:
+                faux_cache.set(cache_name, cache_key, data)
+            if count > 1:
+                data = [
+                    value.unpack(count)
+                    if isinstance(value, DatasetRecord) else value
+                    for value in data
+                ]
             metafunc.parametrize(
                 argnames,
                 data,
-                ids=generate_ids(data, func.name))
+                ids=generate_ids(
+                    data, func.name, metafunc.config.getoption('faux_ids')))
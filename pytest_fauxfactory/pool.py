@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Recycle expensive generated values between tests."""
+from timeit import default_timer
+
+from pytest_fauxfactory.lazy import LazyValue
+
+
+class ObjectPool(object):
+    """Bounded pool of objects built by a callable.
+
+    Objects are built on demand when the pool is empty. Released objects are
+    passed to reset, when given, and kept for the next test as long as the
+    pool holds less than max_size idle objects.
+    """
+
+    def __init__(self, name, factory, args=(), kwargs=None, reset=None,
+                 max_size=1):
+        self.name = name
+        self.factory = factory
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.reset = reset
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.construction_time = 0.0
+        self._idle = []
+
+    def acquire(self):
+        """Return an idle object or build a new one."""
+        if self._idle:
+            self.hits += 1
+            return self._idle.pop()
+        self.misses += 1
+        start = default_timer()
+        obj = self.factory(*self.args, **self.kwargs)
+        self.construction_time += default_timer() - start
+        return obj
+
+    def release(self, obj):
+        """Reset obj and keep it for reuse if the pool is not full.
+
+        Objects failing to reset are dropped and the error is raised again.
+        """
+        if self.reset is not None:
+            self.reset(obj)
+        if len(self._idle) < self.max_size:
+            self._idle.append(obj)
+
+
+class PooledValue(LazyValue):
+    """Placeholder parametrized in place of a pooled object, replaced by an
+    object acquired from pool when the test is set up."""
+
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.index = index
+
+    def resolve(self):
+        return self.pool.acquire()
+
+    def release(self, value):
+        self.pool.release(value)
+
+    def __repr__(self):
+        return '<pooled {} value {}>'.format(self.pool.name, self.index)
+
+
+def report_pools(terminalreporter, pools):
+    """Write the usage of object pools to the terminal."""
+    if not pools:
+        return
+    terminalreporter.write_sep('-', 'fauxfactory pools')
+    for pool in pools:
+        terminalreporter.write_line(
+            '{}: {} hits, {} misses, {:.3f}s spent constructing'.format(
+                pool.name, pool.hits, pool.misses, pool.construction_time))
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Reduce failing generated values to a minimal failing value."""
+import traceback
+import unicodedata
+from timeit import default_timer
+
+from pytest_fauxfactory.helpers import value_digest
+
+# Strings up to this length are also shrunk one character at a time
+SINGLE_CHARACTER_LENGTH = 32
+
+
+def _memo_key(value):
+    """Return the key remembering that value was tried."""
+    return value_digest(value) or repr(value)
+
+
+def failure_signature(exc_type, tb):
+    """Return what identifies a failure: the exception type and the file and
+    line where it was raised."""
+    filename, lineno = traceback.extract_tb(tb)[-1][:2]
+    return exc_type, filename, lineno
+
+
+def _character_class(char):
+    """Return the class of a character: non ASCII or its Unicode major
+    category, such as letter or number."""
+    if ord(char) > 127:
+        return 'non-ascii'
+    return unicodedata.category(char)[0]
+
+
+def shrink_string(value):
+    """Yield simpler candidates for a failing string, simplest first."""
+    length = len(value)
+    if length > 1:
+        yield value[:length // 2]
+        yield value[length // 2:]
+    classes = sorted(set(_character_class(char) for char in value))
+    if len(classes) > 1:
+        for char_class in classes:
+            yield u''.join(
+                char for char in value if _character_class(char) != char_class)
+    if length <= SINGLE_CHARACTER_LENGTH:
+        for index in range(length):
+            yield value[:index] + value[index + 1:]
+
+
+class ShrinkResult(object):
+    """Outcome of shrinking a failing value."""
+
+    def __init__(self, value, attempts, budget_exhausted):
+        self.value = value
+        self.attempts = attempts
+        self.budget_exhausted = budget_exhausted
+
+    def __str__(self):
+        message = 'Minimal failing value after {} attempts: {!r}'.format(
+            self.attempts, self.value)
+        if self.budget_exhausted:
+            message += ' (time budget exhausted)'
+        return message
+
+
+def shrink(value, fails, candidates, budget):
+    """Greedily replace value by the first of its candidates that still
+    fails, until no candidate fails or budget seconds are spent.
+
+    :param value: the failing value
+    :param fails: callable returning True when a candidate value still fails
+    :param candidates: callable yielding simpler candidates for a value
+    :param float budget: seconds available to shrink value
+    """
+    deadline = default_timer() + budget
+    tried = set([_memo_key(value)])
+    attempts = 0
+    improved = True
+    while improved:
+        improved = False
+        for candidate in candidates(value):
+            if default_timer() > deadline:
+                return ShrinkResult(value, attempts, True)
+            key = _memo_key(candidate)
+            if key in tried:
+                continue
+            tried.add(key)
+            attempts += 1
+            if fails(candidate):
+                value = candidate
+                improved = True
+                break
+    return ShrinkResult(value, attempts, False)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Measure the generation of faux mark values."""
+from timeit import default_timer
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+def max_rss():
+    """Return the peak resident set size of the process, or None where it
+    can not be measured."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class GenerationStats(object):
+    """Counters describing the generation of the values of a faux mark.
+
+    :ivar int items: number of values generated
+    :ivar int ignored: number of values dropped by ``pytest_faux_ignore_value``
+    :ivar float duration: seconds spent generating all values
+    :ivar float max_duration: seconds spent generating the slowest value
+    :ivar max_rss_growth: growth of the process peak resident set size
+        during generation, in the unit of ``getrusage`` (kilobytes on Linux),
+        or None where it can not be measured
+    """
+
+    def __init__(self):
+        self.items = 0
+        self.ignored = 0
+        self.duration = 0.0
+        self.max_duration = 0.0
+        self.max_rss_growth = None
+        self._start_rss = max_rss()
+
+    def timed(self, values):
+        """Iterate over values, yielding each one with the seconds spent
+        producing it."""
+        values = iter(values)
+        while True:
+            start = default_timer()
+            try:
+                value = next(values)
+            except StopIteration:
+                break
+            duration = default_timer() - start
+            self.items += 1
+            self.duration += duration
+            self.max_duration = max(self.max_duration, duration)
+            yield value, duration
+        if self._start_rss is not None:
+            self.max_rss_growth = max_rss() - self._start_rss
+
+    def as_dict(self):
+        """Return the counters as a dictionary, e.g. to send them to a metrics
+        collector."""
+        return {
+            'items': self.items,
+            'ignored': self.ignored,
+            'duration': self.duration,
+            'max_duration': self.max_duration,
+            'max_rss_growth': self.max_rss_growth,
+        }
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Test the `--faux-cache` option."""
+
+TEST_MODULE = """
+    import fauxfactory
+    import pytest
+
+    def gen_word():
+        return fauxfactory.gen_alpha(length=12)
+
+    @pytest.mark.faux_callable(3, gen_word)
+    def test_something(value):
+        print('value: ' + value)
+        assert value
+"""
+
+
+def get_values(result):
+    """Extract the values printed by the test module."""
+    return sorted(
+        line.split(': ', 1)[1]
+        for line in result.stdout.lines
+        if line.startswith('value: ')
+    )
+
+
+def test_cache_reuses_values(testdir):
+    """Check that values are reused when nothing changed."""
+    testdir.makepyfile(TEST_MODULE)
+    first = testdir.runpytest('--faux-cache', '-s')
+    first.assert_outcomes(passed=3)
+    assert '0 reused, 1 regenerated' in first.stdout.str()
+    second = testdir.runpytest('--faux-cache', '-s')
+    second.assert_outcomes(passed=3)
+    assert '1 reused, 0 regenerated' in second.stdout.str()
+    assert get_values(first) == get_values(second)
+
+
+def test_cache_regenerates_changed_module(testdir):
+    """Check that values are regenerated when the module changes."""
+    testdir.makepyfile(TEST_MODULE)
+    first = testdir.runpytest('--faux-cache', '-s')
+    first.assert_outcomes(passed=3)
+    testdir.makepyfile(TEST_MODULE.replace('length=12', 'length=13'))
+    second = testdir.runpytest('--faux-cache', '-s', '-v')
+    second.assert_outcomes(passed=3)
+    assert 'test_something/faux_callable: module changed' in (
+        second.stdout.str())
+    assert all(len(value) == 13 for value in get_values(second))
+
+
+def test_cache_skips_non_json_values(testdir):
+    """Check that values not surviving a JSON round trip are not cached."""
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_callable(2, tuple, 'ab')
+        def test_something(value):
+            assert value == ('a', 'b')
+    """)
+    for _ in range(2):
+        result = testdir.runpytest('--faux-cache')
+        result.assert_outcomes(passed=2)
+        assert 'values not JSON serializable: 1' in result.stdout.str()
+
+
+def test_cache_reuses_empty_values(testdir):
+    """Check that an empty cached result still parametrizes the test."""
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_generator(value for value in [])
+        def test_something(value):
+            assert value
+    """)
+    first = testdir.runpytest('--faux-cache')
+    first.assert_outcomes(skipped=1)
+    second = testdir.runpytest('--faux-cache')
+    second.assert_outcomes(skipped=1)
+    assert '1 reused, 0 regenerated' in second.stdout.str()
+
+
+def test_cache_regenerates_changed_hooks(testdir):
+    """Check that values are regenerated when a value hook changes."""
+    testdir.makepyfile(TEST_MODULE)
+    testdir.runpytest('--faux-cache').assert_outcomes(passed=3)
+    testdir.makeconftest("""
+        def pytest_faux_ignore_value(item_index):
+            return item_index > 0
+    """)
+    result = testdir.runpytest('--faux-cache', '-v')
+    result.assert_outcomes(passed=1)
+    assert 'value hooks changed' in result.stdout.str()
+    result = testdir.runpytest('--faux-cache')
+    result.assert_outcomes(passed=1)
+    assert '1 reused, 0 regenerated' in result.stdout.str()
+    testdir.makeconftest("""
+        def pytest_faux_ignore_value(item_index):
+            return item_index > 1
+    """)
+    result = testdir.runpytest('--faux-cache')
+    result.assert_outcomes(passed=2)
+    assert 'value hooks changed: 1' in result.stdout.str()
@@ -235,3 +235,107 @@ def test_callable_generate_with_custom_args(name, age):
     """Test generic function with custom arguments."""
     assert len(name) == 12
     assert 12 <= age <= 100
+
+
+def test_callable_mark_pool(testdir):
+    """Check that pooled objects are reset and reused between tests."""
+    testdir.makepyfile("""
+        import pytest
+
+        BUILT = []
+
+        def build_database():
+            BUILT.append(1)
+            return {'rows': []}
+
+        def reset_database(database):
+            del database['rows'][:]
+
+        @pytest.mark.faux_callable(
+            4, build_database, faux_pool=True, faux_reset=reset_database)
+        def test_something(value):
+            assert value['rows'] == []
+            value['rows'].append(1)
+
+        def test_built_once():
+            assert len(BUILT) == 1
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=5)
+    assert 'build_database: 3 hits, 1 misses' in result.stdout.str()
+    assert result.ret == 0
+
+
+def test_callable_mark_pool_in_fixture(testdir):
+    """Check that fixtures depending on a pooled value get the object."""
+    testdir.makepyfile("""
+        import pytest
+
+        @pytest.fixture
+        def rows(value):
+            return value['rows']
+
+        @pytest.mark.faux_callable(2, dict, rows=[], faux_pool=True)
+        def test_something(value, rows):
+            assert isinstance(value, dict)
+            assert rows is value['rows']
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=2)
+    assert result.ret == 0
+
+
+def test_callable_mark_pool_without_reset(testdir):
+    """Check that objects are recycled as they are without reset."""
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_callable(
+            2, object, faux_pool=True, faux_max_size=1)
+        def test_something(value):
+            assert value is not None
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=2)
+    assert 'object: 1 hits, 1 misses' in result.stdout.str()
+
+
+def test_callable_mark_pool_invalid_max_size(testdir):
+    """Check that max_size must be a positive integer."""
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_callable(
+            2, object, faux_pool=True, faux_max_size=0)
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(error=1)
+    assert 'Mark expected faux_max_size to be an integer greater than 0' in (
+        result.stdout.str())
+    assert result.ret == 2
+
+
+def test_callable_mark_pool_multiple_argnames(testdir):
+    """Check that pooled values can not be unpacked."""
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_callable(2, tuple, faux_pool=True, argnames='a, b')
+        def test_something(a, b):
+            assert a
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(error=1)
+    assert 'Pooled values can not be unpacked' in result.stdout.str()
+    assert result.ret == 2
+
+
+def callable_with_pool_arguments(pool=None, reset=None, max_size=None):
+    """Callable accepting arguments named like other plugin options."""
+    return pool, reset, max_size
+
+
+@pytest.mark.faux_callable(
+    1, callable_with_pool_arguments, pool='pool', reset='reset', max_size=2)
+def test_callable_receives_pool_named_arguments(value):
+    """Check that only faux_ prefixed keywords are used by the plugin."""
+    assert value == ('pool', 'reset', 2)
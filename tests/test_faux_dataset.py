@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""Test the `faux_dataset` mark and the `--faux-dump` option."""
+import json
+
+import pytest
+
+from pytest_fauxfactory.dataset import Dataset, DatasetWriter
+
+
+@pytest.mark.parametrize('extension', ['jsonl', 'bin'])
+def test_dataset_round_trip(tmpdir, extension):
+    """Check that written records are read back in order."""
+    path = str(tmpdir.join('values.{}'.format(extension)))
+    records = ['foo', 1, {'name': 'bar', 'age': 42}, [1, 2, 3]]
+    with DatasetWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+    dataset = Dataset(path)
+    assert len(dataset) == len(records)
+    assert list(dataset) == records
+    assert dataset[2] == records[2]
+    assert dataset[-1] == records[-1]
+    assert list(dataset.iter_records(items=2)) == records[:2]
+
+
+def test_dataset_items_limits_index(tmpdir):
+    """Check that only the first items records are indexed."""
+    path = str(tmpdir.join('values.jsonl'))
+    with DatasetWriter(path) as writer:
+        for record in range(10):
+            writer.write(record)
+    dataset = Dataset(path, items=3)
+    assert len(dataset) == 3
+    assert list(dataset) == [0, 1, 2]
+
+
+def test_dataset_binary_keeps_types(tmpdir):
+    """Check that binary datasets keep non JSON types."""
+    path = str(tmpdir.join('values.bin'))
+    with DatasetWriter(path) as writer:
+        writer.write(('foo', 1))
+    assert Dataset(path)[0] == ('foo', 1)
+
+
+def test_dataset_unsupported_extension(tmpdir):
+    """Check that unknown dataset file extensions are rejected."""
+    with pytest.raises(ValueError):
+        Dataset(str(tmpdir.join('values.csv')))
+
+
+def test_dataset_mark(testdir):
+    """Check that one test is generated per dataset record."""
+    testdir.makefile('.jsonl', values='"foo"\n"bar"\n"baz"\n')
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_dataset('values.jsonl')
+        def test_something(value):
+            assert value in ('foo', 'bar', 'baz')
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=3)
+    assert result.ret == 0
+
+
+def test_dataset_mark_decodes_records_at_setup(testdir):
+    """Check that records are decoded when their test is set up."""
+    testdir.makefile('.jsonl', values='{"name": "foo"}\n{"name": "bar"}\n')
+    testdir.makepyfile("""
+        import pytest
+
+        @pytest.fixture
+        def name(value):
+            return value['name']
+
+        @pytest.mark.faux_dataset('values.jsonl')
+        def test_something(value, name):
+            assert isinstance(value, dict)
+            assert name in ('foo', 'bar')
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=2)
+    assert result.ret == 0
+
+
+def test_dataset_mark_items(testdir):
+    """Check that `items` limits the number of records used."""
+    testdir.makefile('.jsonl', values='"foo"\n"bar"\n"baz"\n')
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_dataset('values.jsonl', items=2)
+        def test_something(value):
+            assert value in ('foo', 'bar')
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=2)
+    assert result.ret == 0
+
+
+def test_dataset_mark_unpacks_records(testdir):
+    """Check that records are unpacked into several arguments."""
+    testdir.makefile('.jsonl', values='[1, "a"]\n[2, "b"]\n')
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_dataset('values.jsonl', argnames='num, letter')
+        def test_something(num, letter):
+            assert (num, letter) in ((1, 'a'), (2, 'b'))
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=2)
+    assert result.ret == 0
+
+
+def test_dataset_mark_unpack_field_count_mismatch(testdir):
+    """Check that records with another number of fields fail their test."""
+    testdir.makefile('.jsonl', values='[1, "a", true]\n')
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_dataset('values.jsonl', argnames='num, letter')
+        def test_something(num, letter):
+            assert num
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(error=1)
+    assert 'can not be unpacked into 2 arguments' in result.stdout.str()
+
+
+def test_dataset_mark_path_relative_to_rootdir(testdir):
+    """Check that relative dataset paths do not depend on the working
+    directory."""
+    testdir.makeini('[pytest]')
+    testdir.makefile('.jsonl', values='"foo"\n"bar"\n')
+    test_file = testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_dataset('values.jsonl')
+        def test_something(value):
+            assert value in ('foo', 'bar')
+    """)
+    testdir.mkdir('sub').chdir()
+    result = testdir.runpytest(str(test_file))
+    result.assert_outcomes(passed=2)
+    assert result.ret == 0
+
+
+def test_dataset_mark_missing_file(testdir):
+    """Check that a missing dataset file is detected."""
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_dataset('missing.jsonl')
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(error=1)
+    result.stdout.fnmatch_lines([
+        '*Dataset file *missing.jsonl does not exist*',
+    ])
+    assert result.ret == 2
+
+
+def test_dump_option(testdir):
+    """Check that `--faux-dump` writes one file per test and mark."""
+    testdir.makepyfile(test_dump="""
+        import pytest
+        @pytest.mark.faux_string(4, 'alpha', length=8)
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest('--faux-dump=dump')
+    result.assert_outcomes(passed=4)
+    path = testdir.tmpdir.join(
+        'dump', 'test_dump.test_something.faux_string.jsonl')
+    values = [json.loads(line) for line in path.readlines()]
+    assert len(values) == 4
+    assert all(len(value) == 8 for value in values)
+
+
+def test_dump_then_load_several_argnames(testdir):
+    """Check that values dumped for several arguments are loaded back into
+    the same arguments."""
+    testdir.makepyfile(test_dump="""
+        import pytest
+
+        def gen():
+            for item in [(1, 'a'), (2, 'b')]:
+                yield item
+
+        @pytest.mark.faux_generator(gen(), argnames='num, letter')
+        def test_something(num, letter):
+            assert isinstance(num, int)
+    """)
+    result = testdir.runpytest('--faux-dump=dump')
+    result.assert_outcomes(passed=2)
+    testdir.makepyfile(test_dump="""
+        import pytest
+        @pytest.mark.faux_dataset(
+            'dump/test_dump.test_something.faux_generator.jsonl',
+            argnames='num, letter')
+        def test_something(num, letter):
+            assert (num, letter) in ((1, 'a'), (2, 'b'))
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=2)
+    assert result.ret == 0
+
+
+def test_dump_option_in_xdist_worker(testdir):
+    """Check that each pytest-xdist worker writes its own shard."""
+    testdir.makeconftest("""
+        def pytest_configure(config):
+            config.workerinput = {'workerid': 'gw1'}
+    """)
+    testdir.makepyfile(test_dump="""
+        import pytest
+        @pytest.mark.faux_string(2)
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest('--faux-dump=dump')
+    result.assert_outcomes(passed=2)
+    assert testdir.tmpdir.join(
+        'dump', 'test_dump.test_something.faux_string.gw1.jsonl').check()
+
+
+def test_dump_then_load(testdir):
+    """Check that dumped values can drive a `faux_dataset` mark."""
+    testdir.makepyfile(test_dump="""
+        import fauxfactory
+        import pytest
+        @pytest.mark.faux_callable(3, fauxfactory.gen_integer)
+        def test_something(value):
+            assert isinstance(value, int)
+    """)
+    result = testdir.runpytest('--faux-dump=dump', '--faux-dump-format=bin')
+    result.assert_outcomes(passed=3)
+    testdir.makepyfile(test_dump="""
+        import pytest
+        @pytest.mark.faux_dataset(
+            'dump/test_dump.test_something.faux_callable.bin')
+        def test_something(value):
+            assert isinstance(value, int)
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=3)
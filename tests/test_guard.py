@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""Test the generation time and memory limits."""
+import pytest
+
+from pytest_fauxfactory.guard import tracemalloc
+
+
+def test_mark_timeout(testdir):
+    """Check that a value taking too long to generate fails collection."""
+    testdir.makepyfile(test_timeout="""
+        import time
+        import pytest
+
+        def slow(calls=[]):
+            calls.append(1)
+            if len(calls) == 3:
+                time.sleep(5)
+            return len(calls)
+
+        @pytest.mark.faux_callable(4, slow, faux_timeout=0.2)
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(error=1)
+    assert (
+        'Generating faux_callable values of test_timeout.test_something: '
+        'item 2 took more than 0.2 seconds'
+    ) in result.stdout.str()
+    assert result.ret == 2
+
+
+def test_global_timeout(testdir):
+    """Check that `--faux-timeout` applies to every mark."""
+    testdir.makepyfile("""
+        import time
+        import pytest
+
+        def slow():
+            time.sleep(5)
+
+        @pytest.mark.faux_callable(1, slow)
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest('--faux-timeout=0.2')
+    result.assert_outcomes(error=1)
+    assert 'item 0 took more than 0.2 seconds' in result.stdout.str()
+
+
+def test_mark_timeout_overrides_global_timeout(testdir):
+    """Check that the mark timeout takes precedence."""
+    testdir.makepyfile("""
+        import time
+        import pytest
+
+        def slow():
+            time.sleep(0.3)
+            return True
+
+        @pytest.mark.faux_callable(1, slow, faux_timeout=5)
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest('--faux-timeout=0.1')
+    result.assert_outcomes(passed=1)
+    assert result.ret == 0
+
+
+def test_mark_max_memory(testdir):
+    """Check that a value allocating too much memory fails collection."""
+    testdir.makepyfile("""
+        import time
+        import pytest
+
+        def greedy():
+            data = [bytearray(1024) for _ in range(5000)]
+            time.sleep(2)
+            return data
+
+        @pytest.mark.faux_callable(1, greedy, faux_max_memory=10 ** 6)
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(error=1)
+    assert 'item 0 allocated more than 1000000 bytes' in result.stdout.str()
+
+
+@pytest.mark.parametrize('factory', [
+    'bytearray(50 * 10 ** 6)',
+    pytest.param(
+        'len(bytearray(50 * 10 ** 6))',
+        marks=pytest.mark.skipif(
+            getattr(tracemalloc, 'reset_peak', None) is None,
+            reason='tracing peaks requires tracemalloc.reset_peak'),
+    ),
+])
+def test_mark_max_memory_fast_allocation(testdir, factory):
+    """Check that allocations done before the first check are caught, even
+    when they are released before the value is returned."""
+    testdir.makepyfile("""
+        import pytest
+
+        @pytest.mark.faux_callable(1, lambda: {}, faux_max_memory=10 ** 6)
+        def test_something(value):
+            assert value
+    """.format(factory))
+    result = testdir.runpytest()
+    result.assert_outcomes(error=1)
+    assert 'item 0 allocated more than 1000000 bytes' in result.stdout.str()
+
+
+def test_generation_errors_are_raised(testdir):
+    """Check that errors raised by guarded callables are kept."""
+    testdir.makepyfile("""
+        import pytest
+
+        def broken():
+            raise ValueError('broken factory')
+
+        @pytest.mark.faux_callable(1, broken, faux_timeout=1)
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(error=1)
+    assert 'broken factory' in result.stdout.str()
+
+
+def test_invalid_timeout(testdir):
+    """Check that the timeout must be a positive number."""
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_string(1, faux_timeout=0)
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(error=1)
+    assert 'Mark expected faux_timeout to be a number greater than 0' in (
+        result.stdout.str())
+    assert result.ret == 2
+
+
+def test_callable_keeps_limit_keywords(testdir):
+    """Check that timeout and max_memory keywords reach the callable."""
+    testdir.makepyfile("""
+        import pytest
+
+        def connect(timeout, max_memory):
+            return (timeout, max_memory)
+
+        @pytest.mark.faux_callable(1, connect, timeout=3, max_memory=10)
+        def test_something(value):
+            assert value == (3, 10)
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=1)
+    assert result.ret == 0
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Test the pytest-fauxfactory hooks."""
+
+
+def test_generation_hooks_are_called(testdir):
+    """Check that generation hooks receive the generated values and stats."""
+    testdir.makeconftest("""
+        CALLS = []
+
+        def pytest_faux_before_generate(mark_name):
+            CALLS.append(('before', mark_name))
+
+        def pytest_faux_value_generated(item_index, value, duration):
+            assert duration >= 0
+            CALLS.append(('value', item_index, value))
+
+        def pytest_faux_after_generate(mark_name, stats):
+            CALLS.append(('after', mark_name, stats.items, stats.ignored))
+
+        def pytest_sessionfinish(session):
+            assert CALLS == [
+                ('before', 'faux_generator'),
+                ('value', 0, 'foo'),
+                ('value', 1, 'bar'),
+                ('after', 'faux_generator', 2, 0),
+            ]
+    """)
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_generator(value for value in ['foo', 'bar'])
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=2)
+    assert result.ret == 0
+
+
+def test_value_generated_hook_transforms_values(testdir):
+    """Check that a value returned by the hook replaces the generated one."""
+    testdir.makeconftest("""
+        def pytest_faux_transform_value(value):
+            return value.upper()
+    """)
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_string(3, 'alpha')
+        def test_something(value):
+            assert value == value.upper()
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=3)
+    assert result.ret == 0
+
+
+def test_ignore_value_hook_drops_values(testdir):
+    """Check that values can be vetoed."""
+    testdir.makeconftest("""
+        def pytest_faux_ignore_value(item_index):
+            return item_index % 2 == 1
+
+        def pytest_faux_after_generate(stats):
+            assert stats.items == 4
+            assert stats.ignored == 2
+    """)
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_string(4)
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=2)
+    assert result.ret == 0
+
+
+def test_value_generated_hook_sees_every_value(testdir):
+    """Check that every observer is called even when a value is
+    transformed."""
+    testdir.makeconftest("""
+        SEEN = []
+
+        def pytest_faux_transform_value(value):
+            return value.upper()
+
+        def pytest_faux_value_generated(value, duration):
+            SEEN.append(('root', value))
+    """)
+    testdir.mkpydir('sub').join('conftest.py').write(
+        'import conftest\n'
+        '\n'
+        'def pytest_faux_value_generated(value, duration):\n'
+        '    conftest.SEEN.append(("sub", value))\n'
+        '\n'
+        'def pytest_sessionfinish(session):\n'
+        '    assert sorted(conftest.SEEN) == [\n'
+        '        ("root", "foo"), ("sub", "foo")]\n'
+    )
+    testdir.tmpdir.join('sub', 'test_something.py').write(
+        'import pytest\n'
+        '\n'
+        '@pytest.mark.faux_generator(value for value in ["foo"])\n'
+        'def test_something(value):\n'
+        '    assert value == "FOO"\n'
+    )
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=1)
+    assert result.ret == 0
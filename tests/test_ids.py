@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Test the generated test IDs."""
+from pytest_fauxfactory.dataset import DatasetWriter
+from pytest_fauxfactory.helpers import generate_ids
+from pytest_fauxfactory.marks import faux_dataset
+
+
+def test_index_ids():
+    """Check that default IDs are built from the value position."""
+    ids = generate_ids(['foo', 'bar'], 'faux_string')
+    assert ids == ['faux_string_0', 'faux_string_1']
+
+
+def test_hash_ids_are_stable():
+    """Check that hash IDs only depend on the values."""
+    ids = generate_ids(['foo', 'bar'], 'faux_string', 'hash')
+    reversed_ids = generate_ids(['bar', 'foo'], 'faux_string', 'hash')
+    assert ids == list(reversed(reversed_ids))
+    assert all(len(value_id) == len('faux_string_') + 8 for value_id in ids)
+
+
+def test_hash_ids_of_huge_values_are_bounded():
+    """Check that hash IDs length does not grow with the value size."""
+    value_id, = generate_ids(['x' * 10 ** 6], 'faux_string', 'hash')
+    assert len(value_id) == len('faux_string_') + 8
+
+
+def test_hash_ids_of_equal_values_are_unique():
+    """Check that equal values still get distinct IDs."""
+    ids = generate_ids(['foo', 'foo', {'a': 1}], 'faux_callable', 'hash')
+    assert len(set(ids)) == 3
+    assert ids[1] == '{}_1'.format(ids[0])
+
+
+def test_hash_ids_ignore_dict_order():
+    """Check that equal dicts get the same ID whatever their key order."""
+    first = generate_ids([{'a': 1, 'b': 2}], 'faux_callable', 'hash')
+    second = generate_ids([{'b': 2, 'a': 1}], 'faux_callable', 'hash')
+    assert first == second
+
+
+def test_hash_ids_of_unstable_values_use_index():
+    """Check that values without a stable digest keep index based IDs."""
+    ids = generate_ids(['foo', object(), set([1])], 'faux_callable', 'hash')
+    assert ids[0] == 'faux_callable_0beec7b5'
+    assert ids[1:] == ['faux_callable_1', 'faux_callable_2']
+
+
+def test_hash_ids_option(testdir):
+    """Check that `--faux-ids=hash` gives the same IDs to the same values."""
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_generator(value for value in ['foo', 'bar'])
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest('--faux-ids=hash', '-v')
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines([
+        '*test_something?faux_generator_0beec7b5? PASSED*',
+        '*test_something?faux_generator_62cdb702? PASSED*',
+    ])
+
+
+def test_hash_ids_of_dataset_records(tmpdir):
+    """Check that dataset records are identified by their encoded bytes
+    wherever they are in the file."""
+    path = str(tmpdir.join('values.jsonl'))
+    tmpdir.join('values.jsonl').write('"foo"\n"bar"\n')
+    ids = generate_ids(list(faux_dataset(path)), 'faux_dataset', 'hash')
+    tmpdir.join('values.jsonl').write('"bar"\n"foo"')
+    reversed_ids = generate_ids(
+        list(faux_dataset(path)), 'faux_dataset', 'hash')
+    assert ids == ['faux_dataset_d465e627', 'faux_dataset_bdb2d8e7']
+    assert ids == list(reversed(reversed_ids))
+
+
+def test_hash_ids_of_unpacked_dataset_records(tmpdir):
+    """Check that records unpacked into several arguments get hash IDs."""
+    path = str(tmpdir.join('values.bin'))
+    with DatasetWriter(path) as writer:
+        writer.write((1, 'a'))
+        writer.write((2, 'b'))
+    data = [record.unpack(2) for record in faux_dataset(path)]
+    ids = generate_ids(data, 'faux_dataset', 'hash')
+    assert len(set(ids)) == 2
+    assert ids != ['faux_dataset_0', 'faux_dataset_1']
+
+
+def test_hash_ids_option_with_dataset(testdir):
+    """Check that `--faux-ids=hash` identifies dataset records."""
+    testdir.makefile('.jsonl', values='"foo"\n"bar"\n')
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_dataset('values.jsonl')
+        def test_something(value):
+            assert value
+    """)
+    result = testdir.runpytest('--faux-ids=hash', '-v')
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines([
+        '*test_something?faux_dataset_d465e627? PASSED*',
+        '*test_something?faux_dataset_bdb2d8e7? PASSED*',
+    ])
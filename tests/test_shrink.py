@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Test the `--faux-shrink` option."""
+from pytest_fauxfactory.shrink import shrink, shrink_string
+
+
+def test_shrink_string_candidates():
+    """Check that strings are halved then stripped of character classes."""
+    candidates = list(shrink_string(u'ab12'))
+    assert candidates[:2] == [u'ab', u'12']
+    assert u'12' in candidates[2:]
+    assert u'ab' in candidates[2:]
+    assert u'b12' in candidates
+
+
+def test_shrink_finds_minimal_value():
+    """Check that shrinking keeps the simplest failing candidate."""
+    result = shrink(u'xxxx1xxxxxxx', lambda value: u'1' in value,
+                    shrink_string, budget=10)
+    assert result.value == u'1'
+    assert not result.budget_exhausted
+
+
+def test_shrink_never_tries_a_candidate_twice():
+    """Check that candidates are memoized."""
+    tried = []
+
+    def fails(value):
+        tried.append(value)
+        return u'1' in value
+
+    shrink(u'11111111', fails, shrink_string, budget=10)
+    assert len(tried) == len(set(tried))
+
+
+def test_shrink_budget():
+    """Check that shrinking stops once the time budget is spent."""
+    result = shrink(u'x' * 64, lambda value: True, shrink_string, budget=0)
+    assert result.value == u'x' * 64
+    assert result.budget_exhausted
+
+
+def test_shrink_option_with_string(testdir):
+    """Check that the minimal failing string is reported."""
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_generator(value for value in ['abc123XYZ!'])
+        def test_something(value):
+            assert '2' not in value
+    """)
+    result = testdir.runpytest('--faux-shrink')
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines([
+        "*test_something*: Minimal failing value after * attempts: '2'",
+    ])
+
+
+def test_shrink_option_keeps_original_failure(testdir):
+    """Check that candidates failing for another reason are not kept."""
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_generator(value for value in ['xxxaxxxx'])
+        def test_something(value):
+            first = value[0]
+            assert 'a' not in value
+    """)
+    result = testdir.runpytest('--faux-shrink')
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines([
+        "*test_something*: Minimal failing value after * attempts: 'a'",
+    ])
+
+
+def test_shrink_option_with_callback(testdir):
+    """Check that faux_callable values are shrunk with the faux_shrink
+    callback."""
+    testdir.makepyfile("""
+        import pytest
+
+        def simplify(value):
+            return [value // 2, value - 1]
+
+        @pytest.mark.faux_callable(1, int, 1000, faux_shrink=simplify)
+        def test_something(value):
+            assert value <= 10
+    """)
+    result = testdir.runpytest('--faux-shrink')
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines([
+        '*test_something*: Minimal failing value after * attempts: 11',
+    ])
+
+
+def test_shrink_callback_without_option(testdir):
+    """Check that the faux_shrink callback is not passed to the callable."""
+    testdir.makepyfile("""
+        import pytest
+        @pytest.mark.faux_callable(1, int, 1000, faux_shrink=lambda value: [])
+        def test_something(value):
+            assert value == 1000
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=1)
+    assert 'fauxfactory shrink' not in result.stdout.str()
+
+
+def test_callable_keeps_shrink_keyword(testdir):
+    """Check that a shrink keyword reaches the callable."""
+    testdir.makepyfile("""
+        import pytest
+
+        def compress(shrink):
+            return shrink
+
+        @pytest.mark.faux_callable(1, compress, shrink=True)
+        def test_something(value):
+            assert value is True
+    """)
+    result = testdir.runpytest('--faux-shrink')
+    result.assert_outcomes(passed=1)
+    assert result.ret == 0